@@ -4,65 +4,262 @@ import os
 import hashlib
 import argparse
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import logging
-import re
+import mmap
+import sys
+
+try:
+    # BLAKE3 is much faster than SHA-256 and collision resistance is all we need
+    from blake3 import blake3 as new_hasher
+    HASH_NAME = "BLAKE3"
+    HASH_ACCELERATED = True
+    # Older blake3 releases lack update_mmap and multithreaded hashing
+    HASH_MULTITHREADED = hasattr(new_hasher, "update_mmap")
+except ImportError:
+    new_hasher = hashlib.sha256
+    HASH_MULTITHREADED = False
+    HASH_NAME = "SHA-256"
+    HASH_ACCELERATED = new_hasher.__module__ == "_hashlib"
+    if HASH_ACCELERATED:
+        import ssl
+        # OpenSSL selects its SHA-NI code path by itself on CPUs that support it
+        HASH_NAME = f"SHA-256 ({ssl.OPENSSL_VERSION})"
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Read size for the manual hashing loop used before Python 3.11
+HASH_BUFFER_SIZE = 1024 * 1024  # 1 MiB
+
+# Bytes sampled from each end of a file before committing to a full hash
+SAMPLE_SIZE = 64 * 1024  # 64 KiB
+
+# Files at least this large are hashed straight from a memory mapping
+MMAP_THRESHOLD = 4 * 1024 * 1024  # 4 MiB
+
+# Maximum number of files hashed per worker task
+HASH_BATCH_SIZE = 16
+
+# Log scan progress every this many files
+PROGRESS_INTERVAL = 1000
+
+@dataclass(slots=True)
+class FileMeta:
+    """A scanned file with the stat and name details needed to report and rank duplicates."""
+    path: Path
+    size: int
+    mtime: float
+    has_numbered_suffix: bool
+    # Ranking checks the stem instead of the name, so 'IMG_001.edit.jpg' counts
+    # as numbered there while it is reported as not numbered
+    stem_has_numbered_suffix: bool
+    name_len: int
+
 class DuplicateFinder:
-    def __init__(self, directory: str):
+    def __init__(self, directory: str, max_workers: Optional[int] = None):
         self.directory = Path(directory)
-        self.hash_map: Dict[str, List[Path]] = defaultdict(list)
-        # Regular expression for matching numbered suffixes like _001, _1, etc.
-        self.numbered_suffix_pattern = re.compile(r'_\d+$')
-        
-    def calculate_file_hash(self, filepath: Path) -> str:
-        """Calculate SHA-256 hash of a file."""
-        hash_sha256 = hashlib.sha256()
+        # Number of files read concurrently; None uses ThreadPoolExecutor's
+        # I/O-oriented default of min(32, cpu_count + 4)
+        self.max_workers = max_workers
+        self.renamed_count = 0
         
+    def calculate_file_hash(self, filepath: Path) -> bytes:
+        """Calculate the raw content digest of a file (BLAKE3 if available, else SHA-256)."""
         try:
             with open(filepath, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_sha256.update(chunk)
-            return hash_sha256.hexdigest()
+                if hasattr(os, "posix_fadvise"):
+                    # One-shot sequential read: ask for more readahead and
+                    # for the pages not to displace the rest of the page cache
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_NOREUSE)
+                if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+                    if HASH_MULTITHREADED:
+                        # BLAKE3 is tree-structured, so one large file (e.g. a video)
+                        # can be spread across all cores
+                        hasher = new_hasher(max_threads=new_hasher.AUTO)
+                        hasher.update_mmap(filepath)
+                        return hasher.digest()
+                    # Hash the page cache directly instead of copying chunks into bytes
+                    hasher = new_hasher()
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if hasattr(mmap, "MADV_SEQUENTIAL"):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        hasher.update(mm)
+                    return hasher.digest()
+                if sys.version_info >= (3, 11):
+                    # file_digest runs the read/update loop in C
+                    return hashlib.file_digest(f, new_hasher).digest()
+                hasher = new_hasher()
+                for chunk in iter(lambda: f.read(HASH_BUFFER_SIZE), b""):
+                    hasher.update(chunk)
+                return hasher.digest()
         except Exception as e:
             logging.error(f"Error calculating hash for {filepath}: {e}")
-            return ""
+            return b""
+
+    def calculate_sample_hash(self, filepath: Path, size: int) -> bytes:
+        """
+        Hash the first and last SAMPLE_SIZE bytes of a file.
+        Files up to 2 * SAMPLE_SIZE are read completely, so for them the
+        result equals calculate_file_hash.
+        """
+        hasher = new_hasher()
+        
+        try:
+            with open(filepath, "rb") as f:
+                if size <= 2 * SAMPLE_SIZE:
+                    hasher.update(f.read())
+                else:
+                    hasher.update(f.read(SAMPLE_SIZE))
+                    f.seek(-SAMPLE_SIZE, os.SEEK_END)
+                    hasher.update(f.read(SAMPLE_SIZE))
+            return hasher.digest()
+        except Exception as e:
+            logging.error(f"Error calculating sample hash for {filepath}: {e}")
+            return b""
 
     def rename_jpeg_to_jpg(self, filepath: Path) -> Path:
         """Rename .jpeg files to .jpg extension."""
         if filepath.suffix.lower() in ['.jpeg']:
             new_filepath = filepath.with_suffix('.jpg')
+            # rename() would silently replace an existing .jpg, losing that file
+            if new_filepath.exists():
+                logging.warning(f"Not renaming {filepath}: {new_filepath} already exists")
+                return filepath
             try:
                 filepath.rename(new_filepath)
-                logging.info(f"Renamed {filepath} to {new_filepath}")
+                self.renamed_count += 1
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    logging.debug(f"Renamed {filepath} to {new_filepath}")
                 return new_filepath
             except Exception as e:
                 logging.error(f"Error renaming {filepath}: {e}")
                 return filepath
         return filepath
 
-    def find_duplicates(self) -> Dict[str, List[Path]]:
-        """Scan directory and find duplicate files based on content."""
+    def _map_in_batches(self, executor: ThreadPoolExecutor, func: Callable, items: list) -> Iterator:
+        """
+        Like executor.map(func, items), but hands several items to each worker task.
+        Hashing many small files otherwise spends more time in executor bookkeeping
+        than in hashlib. Batches shrink so every worker still gets several tasks.
+        """
+        workers = self.max_workers
+        if workers is None:
+            workers = min(32, (os.cpu_count() or 1) + 4)
+        batch_size = max(1, min(HASH_BATCH_SIZE, len(items) // (workers * 4)))
+        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        for results in executor.map(lambda batch: [func(item) for item in batch], batches):
+            yield from results
+
+    def _iter_files(self, directory: Path) -> Iterator[os.DirEntry]:
+        """
+        Recursively yield DirEntry objects for all files below directory.
+        Each listing is read completely before its entries are yielded, so
+        renaming .jpeg files meanwhile can't make the scan see them twice.
+        """
+        with os.scandir(directory) as it:
+            entries = list(it)
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from self._iter_files(Path(entry.path))
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+    def _scan_sizes(self) -> Dict[int, List[FileMeta]]:
+        """Walk the directory and group files by size."""
         logging.info(f"Scanning directory: {self.directory}")
         
+        size_map: Dict[int, List[FileMeta]] = defaultdict(list)
+        # Paths already collected, so one file can never be grouped with itself
+        seen_paths: Set[Path] = set()
         file_count = 0
-        for filepath in self.directory.rglob("*"):
-            if filepath.is_file():
-                logging.info(f"Processing: {filepath}")
-                # Rename jpeg to jpg if necessary
-                filepath = self.rename_jpeg_to_jpg(filepath)
-                file_count += 1
-                file_hash = self.calculate_file_hash(filepath)
-                if file_hash:
-                    self.hash_map[file_hash].append(filepath)
-        
-        # Filter out files without duplicates
-        duplicates = {k: v for k, v in self.hash_map.items() if len(v) > 1}
+        # Per-file messages are only built when debug logging is on
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+        for entry in self._iter_files(self.directory):
+            filepath = Path(entry.path)
+            if debug:
+                logging.debug(f"Processing: {filepath}")
+            # Stat before renaming, DirEntry caches the result for the old path
+            stat = entry.stat(follow_symlinks=False)
+            # Rename jpeg to jpg if necessary
+            filepath = self.rename_jpeg_to_jpg(filepath)
+            if filepath in seen_paths:
+                logging.warning(f"Skipping {filepath}, it was already scanned")
+                continue
+            seen_paths.add(filepath)
+            file_count += 1
+            # Collect everything later steps need now, so nothing is stat'ed again
+            meta = FileMeta(
+                path=filepath,
+                size=stat.st_size,
+                mtime=stat.st_mtime,
+                has_numbered_suffix=self.has_numbered_suffix(filepath.name),
+                stem_has_numbered_suffix=self.has_numbered_suffix(filepath.stem),
+                name_len=len(filepath.name),
+            )
+            size_map[meta.size].append(meta)
+            if file_count % PROGRESS_INTERVAL == 0:
+                logging.info(f"Scanned {file_count} files")
         
         logging.info(f"Processed {file_count} files total")
+        if self.renamed_count:
+            logging.info(f"Renamed {self.renamed_count} .jpeg files to .jpg")
+        return size_map
+
+    def iter_duplicate_groups(self) -> Iterator[Tuple[bytes, List[FileMeta]]]:
+        """
+        Scan directory and yield (digest, files) for each group of identical files
+        as soon as it is confirmed. Digests are only kept per candidate group,
+        not for every file in the tree.
+        """
+        # First pass: group files by size, only files sharing a size can be duplicates
+        size_buckets = [metas for metas in self._scan_sizes().values() if len(metas) > 1]
+        
+        # Second pass: hash only the head and tail of files with at least one
+        # same-sized candidate. hashlib releases the GIL while hashing, so threads
+        # run in parallel and keep several reads in flight to use the device queue depth.
+        candidates = [meta for metas in size_buckets for meta in metas]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            sample_hashes = self._map_in_batches(
+                executor, lambda m: self.calculate_sample_hash(m.path, m.size), candidates
+            )
+            sample_groups: List[List[FileMeta]] = []
+            for metas in size_buckets:
+                by_sample: Dict[bytes, List[FileMeta]] = defaultdict(list)
+                for meta, sample_hash in zip(metas, sample_hashes):
+                    if sample_hash:
+                        by_sample[sample_hash].append(meta)
+                for sample_hash, group in by_sample.items():
+                    if len(group) < 2:
+                        continue
+                    if group[0].size <= 2 * SAMPLE_SIZE:
+                        # Small files were read completely, their sample hash is final
+                        yield sample_hash, group
+                    else:
+                        sample_groups.append(group)
+            
+            # Third pass: fully hash files that match on both size and sample
+            full_candidates = [meta for group in sample_groups for meta in group]
+            file_hashes = self._map_in_batches(
+                executor, lambda m: self.calculate_file_hash(m.path), full_candidates
+            )
+            for metas in sample_groups:
+                by_hash: Dict[bytes, List[FileMeta]] = defaultdict(list)
+                for meta, file_hash in zip(metas, file_hashes):
+                    if file_hash:
+                        by_hash[file_hash].append(meta)
+                for file_hash, group in by_hash.items():
+                    if len(group) > 1:
+                        yield file_hash, group
+
+    def find_duplicates(self) -> Dict[bytes, List[FileMeta]]:
+        """Scan directory and find duplicate files based on content."""
+        duplicates = dict(self.iter_duplicate_groups())
+        
         if duplicates:
             total_duplicates = sum(len(files) for files in duplicates.values())
             logging.info(f"Found {len(duplicates)} groups of duplicates with {total_duplicates} total files")
@@ -73,41 +270,82 @@ class DuplicateFinder:
 
     def has_numbered_suffix(self, filename: str) -> bool:
         """Check if the filename ends with a numbered suffix like _001."""
-        return bool(self.numbered_suffix_pattern.search(filename.rsplit('.', 1)[0]))
+        stem = filename.rsplit('.', 1)[0]
+        # Scan back over the trailing digits, they must be preceded by an underscore
+        i = len(stem)
+        while i > 0 and stem[i - 1].isdecimal():
+            i -= 1
+        return 0 < i < len(stem) and stem[i - 1] == '_'
     
-    def get_filename_score(self, filepath: Path) -> tuple:
+    def get_filename_score(self, meta: FileMeta) -> tuple:
         """
         Calculate a score for filename prioritization.
         Returns a tuple of (is_not_numbered, filename_length) for sorting.
         Files without numbered suffixes get priority (1), files with numbered suffixes get (0).
         """
-        filename = filepath.stem  # Get filename without extension
-        is_not_numbered = 0 if self.has_numbered_suffix(filename) else 1
-        return (is_not_numbered, len(filepath.name))
-
-    def remove_duplicates(self, duplicates: Dict[str, List[Path]], keep_newest: bool = True, keep_longest_name: bool = False) -> None:
-        """Remove duplicate files, keeping either the newest version or the one with the longest filename."""
-        for hash_value, file_list in duplicates.items():
-            if keep_longest_name:
-                # Sort files by our custom scoring function
-                # This will first prioritize files without numbered suffixes,
-                # then by filename length within each group
-                sorted_files = sorted(file_list, key=self.get_filename_score, reverse=True)
-            else:
-                # Sort files by modification time
-                sorted_files = sorted(file_list, key=lambda x: x.stat().st_mtime, reverse=keep_newest)
-            
-            # Keep the first file (longest name or newest/oldest depending on settings)
-            keep_file = sorted_files[0]
-            files_to_remove = sorted_files[1:]
-            
-            logging.info(f"Keeping: {keep_file}")
-            for file_to_remove in files_to_remove:
-                try:
-                    file_to_remove.unlink()
-                    logging.info(f"Removed duplicate: {file_to_remove}")
-                except Exception as e:
-                    logging.error(f"Error removing {file_to_remove}: {e}")
+        is_not_numbered = 0 if meta.stem_has_numbered_suffix else 1
+        return (is_not_numbered, meta.name_len)
+
+    def _safe_unlink(self, filepath: Path) -> bool:
+        """Remove a file, logging instead of raising on failure. Returns True if it was removed."""
+        try:
+            filepath.unlink()
+            logging.info(f"Removed duplicate: {filepath}")
+            return True
+        except Exception as e:
+            logging.error(f"Error removing {filepath}: {e}")
+            return False
+
+    def remove_duplicates(self, duplicates: Iterable[Tuple[bytes, List[FileMeta]]], keep_newest: bool = True, keep_longest_name: bool = False) -> int:
+        """
+        Remove duplicate files, keeping either the newest version or the one with the longest filename.
+        Accepts (digest, files) pairs, e.g. find_duplicates().items() or iter_duplicate_groups().
+        Returns the number of files actually removed.
+        """
+        removals = []
+        # unlink() blocks on filesystem metadata updates, which is slow on
+        # network filesystems, so remove files concurrently as groups arrive
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for hash_value, file_list in duplicates:
+                if keep_longest_name:
+                    # Sort files by our custom scoring function
+                    # This will first prioritize files without numbered suffixes,
+                    # then by filename length within each group
+                    sorted_files = sorted(file_list, key=self.get_filename_score, reverse=True)
+                else:
+                    # Sort files by modification time, cached at walk time
+                    sorted_files = sorted(file_list, key=attrgetter("mtime"), reverse=keep_newest)
+                
+                # Keep the first file (longest name or newest/oldest depending on settings)
+                keep_file = sorted_files[0].path
+                logging.info(f"Keeping: {keep_file}")
+                for meta in sorted_files[1:]:
+                    removals.append(executor.submit(self._safe_unlink, meta.path))
+            return sum(future.result() for future in removals)
+
+def print_duplicate_group(hash_value: bytes, file_list: List[FileMeta]) -> None:
+    """Print one group of duplicate files with the details used to pick the one to keep."""
+    print(f"\nDuplicate files (hash: {hash_value.hex()}):")
+    for meta in file_list:
+        numbered = "Yes" if meta.has_numbered_suffix else "No"
+        print(f"  - {meta.path}")
+        print(f"    (Name length: {meta.name_len}, Has numbered suffix: {numbered}, Modified: {meta.mtime})")
+
+def print_duplicate_groups(groups: Iterable[Tuple[bytes, List[FileMeta]]]) -> Iterator[Tuple[bytes, List[FileMeta]]]:
+    """Print each duplicate group as it passes through."""
+    for hash_value, file_list in groups:
+        print_duplicate_group(hash_value, file_list)
+        yield hash_value, file_list
+
+def positive_int(value: str) -> int:
+    """argparse type for options that need a whole number of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 def main():
     parser = argparse.ArgumentParser(description="Find and manage duplicate files in a directory")
@@ -118,10 +356,30 @@ def main():
                        help="Keep the file with the longest filename (contains more metadata)")
     parser.add_argument("--force", action="store_true", 
                        help="Don't ask for confirmation before removing files")
+    parser.add_argument("--workers", type=positive_int, default=None,
+                       help="Number of files to read concurrently (default: min(32, CPU count + 4))")
     
     args = parser.parse_args()
     
-    finder = DuplicateFinder(args.directory)
+    logging.info(f"Hashing with {HASH_NAME}")
+    if not HASH_ACCELERATED:
+        logging.warning("hashlib is not backed by OpenSSL, hashing will be slow; "
+                        "install blake3 for hardware-accelerated hashing")
+    
+    finder = DuplicateFinder(args.directory, max_workers=args.workers)
+    
+    if args.remove and args.force:
+        # Nothing to confirm, so print and remove each group as soon as it is
+        # confirmed instead of collecting every group first
+        removed = finder.remove_duplicates(print_duplicate_groups(finder.iter_duplicate_groups()),
+                                           keep_newest=not args.keep_oldest,
+                                           keep_longest_name=args.keep_longest_name)
+        if removed:
+            logging.info(f"Duplicate removal completed, removed {removed} files.")
+        else:
+            logging.info("No duplicate files found.")
+        return
+    
     duplicates = finder.find_duplicates()
     
     if not duplicates:
@@ -130,24 +388,19 @@ def main():
     
     # Print duplicate files
     for hash_value, file_list in duplicates.items():
-        print(f"\nDuplicate files (hash: {hash_value}):")
-        for file_path in file_list:
-            numbered = "Yes" if finder.has_numbered_suffix(file_path.name) else "No"
-            print(f"  - {file_path}")
-            print(f"    (Name length: {len(file_path.name)}, Has numbered suffix: {numbered}, Modified: {file_path.stat().st_mtime})")
+        print_duplicate_group(hash_value, file_list)
     
     if args.remove:
         total_duplicates = sum(len(files) - 1 for files in duplicates.values())
-        if not args.force:
-            confirm = input(f"\nAre you sure you want to remove {total_duplicates} duplicate files? (yes/no): ")
-            if confirm.lower() != "yes":
-                logging.info("Duplicate removal cancelled.")
-                return
+        confirm = input(f"\nAre you sure you want to remove {total_duplicates} duplicate files? (yes/no): ")
+        if confirm.lower() != "yes":
+            logging.info("Duplicate removal cancelled.")
+            return
         
-        finder.remove_duplicates(duplicates, 
-                              keep_newest=not args.keep_oldest,
-                              keep_longest_name=args.keep_longest_name)
-        logging.info("Duplicate removal completed.")
+        removed = finder.remove_duplicates(duplicates.items(), 
+                                           keep_newest=not args.keep_oldest,
+                                           keep_longest_name=args.keep_longest_name)
+        logging.info(f"Duplicate removal completed, removed {removed} of {total_duplicates} files.")
 
 if __name__ == "__main__":
     main()
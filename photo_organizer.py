@@ -1,15 +1,56 @@
 #!/usr/bin/env python3
 
 import os
+import atexit
 import logging
 import subprocess
-import json
 from datetime import datetime
 from pathlib import Path
 import re
 import shutil
+import sqlite3
+import struct
+import sys
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Optional
 import hashlib
+import mmap
+from functools import lru_cache, partial
+from itertools import islice
+
+# fcntl (for reflink clones) is only available on Unix
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ioctl request for a reflink clone on Linux (btrfs, XFS); the fcntl module
+# only names it from Python 3.12. The number means something else, or
+# nothing, on other systems, so clones are only tried on Linux.
+if sys.platform.startswith('linux'):
+    FICLONE = getattr(fcntl, 'FICLONE', 0x40049409)
+else:
+    FICLONE = None
+
+# xxHash is much faster than hashlib for duplicate fingerprints; fall back to
+# BLAKE2b from the standard library if it isn't installed
+try:
+    import xxhash
+    new_fingerprint = xxhash.xxh3_64
+    FINGERPRINT_NAME = 'xxh3_64'
+except ImportError:
+    new_fingerprint = partial(hashlib.blake2b, digest_size=16)
+    FINGERPRINT_NAME = 'blake2b-128'
+
+# orjson parses exiftool's JSON output several times faster than the json
+# module; both accept the raw bytes, so no decode step is needed either way
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 # Configure logging
 logging.basicConfig(
@@ -23,7 +64,111 @@ INPUT_DIR = "./input"
 OUTPUT_DIR = "./output"
 UNPROCESSED_DIR = "./output/unprocessed"  # Directory for unprocessed files
 UNREALISTIC_DATES = ['1970-01-01', '1980-01-01']  # Default dates often set by cameras/systems
+# The same dates as (year, month, day) for cheap membership checks
+UNREALISTIC_DATE_TUPLES = {
+    tuple(int(part) for part in date.split('-')) for date in UNREALISTIC_DATES
+}
 MIN_VALID_YEAR = 1985  # Earliest acceptable year for photos
+_CURRENT_YEAR = datetime.now().year  # Latest acceptable year, fixed for the run
+_DAYS_IN_MONTH = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)  # February's 29th is checked separately
+
+# Filename date patterns, compiled once and tried in order.
+# The tag says how the captured groups map onto date and time fields.
+FILENAME_DATE_PATTERNS = [
+    # Full datetime patterns
+    (re.compile(r'(\d{4})-(\d{2})-(\d{2})-(\d{2})-(\d{2})-(\d{2})'), 'ymd_hms'),  # YYYY-MM-DD-HH-MM-SS
+    (re.compile(r'(\d{2})-(\d{2})-(\d{4})-(\d{2})-(\d{2})-(\d{2})'), 'dmy_hms'),  # DD-MM-YYYY-HH-MM-SS
+    (re.compile(r'(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})'), 'ymd_hms'),      # YYYYMMDD_HHMMSS
+    (re.compile(r'(\d{4})-(\d{2})-(\d{2})_(\d{2})-(\d{2})-(\d{2})'), 'ymd_hms'),  # YYYY-MM-DD_HH-MM-SS
+    (re.compile(r'(\d{4})_(\d{2})_(\d{2})_(\d{2})_(\d{2})_(\d{2})'), 'ymd_hms'),  # YYYY_MM_DD_HH_MM_SS
+    (re.compile(r'(\d{2})-(\d{2})-(\d{4})_(\d{2})(\d{2})(\d{2})'), 'dmy_hms'),    # DD-MM-YYYY_HHMMSS
+    (re.compile(r'(\d{8})-(\d{6})'), 'date8_time6'),                                  # YYYYMMDD-HHMMSS
+    (re.compile(r'(\d{12})'), 'digits12'),                                            # YYYYMMDDHHMM
+    
+    # Date-only patterns
+    (re.compile(r'(\d{4})-(\d{2})-(\d{2})'), 'ymd'),                              # YYYY-MM-DD
+    (re.compile(r'(\d{2})-(\d{2})-(\d{4})'), 'dmy')                               # DD-MM-YYYY
+]
+
+# All of the above as one alternation: a single scan tells whether any of them
+# can match, so filenames without a date skip the per-pattern searches
+FILENAME_DATE_ANY = re.compile('|'.join(pattern.pattern for pattern, _ in FILENAME_DATE_PATTERNS))
+
+# Characters in camera model names that are unsafe or unwanted in filenames
+MODEL_TRANSLATION = str.maketrans({
+    ' ': '-',
+    '/': '-',
+    '\\': '-',
+    ',': '_',
+    '(': None,
+    ')': None
+})
+
+# Camera makes with a fixed cleaned-up name, keyed by the lowercased EXIF Make
+MAKE_OVERRIDES = {
+    'sonyericsson': 'SonyEricsson',
+    'pentaxcorporation': 'Pentax',
+    'pentax': 'Pentax',
+    'pentax corporation': 'Pentax',
+    'nikoncorporation': 'Nikon',
+    'nikon': 'Nikon',
+    'nikon corporation': 'Nikon',
+    'sony': 'Sony',
+    'canon': 'Canon'
+}
+
+# First eight bytes of every PNG file
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Cleaned-up makes that are already in their final form
+HARDCODED_MAKES = frozenset({'SonyEricsson', 'Pentax', 'Nikon', 'Sony', 'Apple'})
+
+# Software names (lowercase substrings) that indicate non-photo images
+NON_PHOTO_SOFTWARE = (
+    'photoshop',
+    'illustrator',
+    'inkscape',
+    'gimp',
+    'paint',
+    'sketch',
+    'figma',
+    'xd',
+    'canva'
+)
+
+# Color spaces typical of camera photos
+PHOTO_COLOR_SPACES = frozenset({'srgb', 'adobe rgb', 'prophoto rgb'})
+
+# Letter runs and digit runs that to_camel_case joins back together
+CAMEL_CASE_TOKEN = re.compile(r'[a-zA-Z]+|\d+')
+
+# Nikon D and Z series model numbers
+NIKON_D_MODEL = re.compile(r'D\d{3,4}', re.IGNORECASE)
+NIKON_Z_MODEL = re.compile(r'Z\d{1,2}', re.IGNORECASE)
+
+# Timestamp patterns removed from names by extract_timestamp_from_filename,
+# combined into one alternation and ordered longest match first, so a full
+# date-time is removed as a whole before its date part could match on its own
+TIMESTAMP_PATTERN = re.compile('|'.join((
+    r'\d{4}-\d{2}-\d{2}[-_]\d{2}[-_]\d{2}[-_]\d{2}',  # YYYY-MM-DD-HH-MM-SS or with underscores
+    r'\d{4}[-_]\d{2}[-_]\d{2}[-_]\d{2}[-_]\d{2}[-_]\d{2}',  # YYYY_MM_DD_HH_MM_SS or with dashes
+    r'\d{2}-\d{2}-\d{4}[-_]\d{2}[-_]\d{2}[-_]\d{2}',  # DD-MM-YYYY-HH-MM-SS or with underscores
+    r'\d{2}-\d{2}-\d{4}[-_]\d{6}',              # DD-MM-YYYY_HHMMSS
+    r'\d{8}[-_]\d{6}',                           # YYYYMMDD-HHMMSS or YYYYMMDD_HHMMSS
+    r'\d{14}',                                    # YYYYMMDDHHMMSS
+    r'\d{6}[-_]\d{6}',                           # DDMMYY-HHMMSS
+    r'\d{4}-\d{2}-\d{2}',                        # YYYY-MM-DD
+    r'\d{2}-\d{2}-\d{4}',                        # DD-MM-YYYY
+    r'\d{8}'                                      # YYYYMMDD
+)))
+
+# Other patterns used on every file
+SEPARATOR_RUN = re.compile(r'[-_]+')
+SPACE_DASH_RUN = re.compile(r'[ -]+')
+DIGIT_RUN = re.compile(r'\d+')
+NON_ALPHANUMERIC = re.compile(r'[^a-zA-Z0-9]')
+NAME_SEGMENT = re.compile(r'[^_-]+')  # the parts between - and _ separators
+COUNTER_SUFFIX = re.compile(r'([_-]\d{3})(?:[_-]|$)')  # e.g. '_001' in 'name_001'
 
 # Shutter count EXIF tags for different cameras
 SHUTTER_COUNT_TAGS = [
@@ -36,6 +181,54 @@ SHUTTER_COUNT_TAGS = [
     'ImageNumber'               # Alternative
 ]
 
+# Options for every metadata read. -fast stops exiftool from scanning past the
+# image data for trailers; -fast2 would also skip maker notes, which is where
+# shutter counts live.
+METADATA_OPTIONS = ['-fast']
+
+# Every tag the metadata helpers look at, fetched with a single exiftool call per file
+ALL_TAGS = [
+    '-Make',
+    '-Model',
+    '-Software',
+    '-ImageWidth',
+    '-ImageHeight',
+    '-ColorSpace',
+    '-Compression',
+    '-FileType',
+    '-CreateDate',
+    '-DateTimeOriginal',
+    '-ScreenCaptureType'
+] + ['-' + tag for tag in SHUTTER_COUNT_TAGS]
+
+# Read size when comparing two files byte for byte
+COMPARE_BUFFER_SIZE = 1024 * 1024  # 1 MB
+
+# Largest single kernel copy when a file has to be copied
+COPY_CHUNK_SIZE = 64 * 1024 * 1024  # 64 MB
+
+# Files at least this large are fingerprinted through mmap rather than read()
+MMAP_FINGERPRINT_SIZE = 64 * 1024 * 1024  # 64 MB
+
+# Bytes read from the start of a file for the duplicate prefilter
+QUICK_SIGNATURE_SIZE = 4096
+
+# Content fingerprints of compared files, reused across runs
+HASH_CACHE_FILE = os.path.expanduser("~/.cache/photo-organizer/hashes.sqlite")
+
+# Number of files handed to exiftool per batch metadata command
+EXIFTOOL_BATCH_SIZE = 500
+
+# Number of exiftool processes shared by the worker threads
+EXIFTOOL_PROCESSES = 4
+
+# Number of files processed concurrently; workers mostly wait on disk and exiftool
+MAX_WORKERS = (os.cpu_count() or 4) * 2
+
+# Files read from the input tree but not yet processed; enough for the next
+# metadata batch to be read while the workers are busy with the previous one
+MAX_PENDING_FILES = EXIFTOOL_BATCH_SIZE * 2
+
 # Image file extensions
 JPG_EXTENSIONS = {
     '.jpg', 
@@ -84,6 +277,363 @@ SUPPORTED_EXTENSIONS = (
     .union(TIFF_EXTENSIONS)
 )
 
+class ExifToolDaemon:
+    """
+    A single long-running exiftool process (-stay_open True) that reads
+    commands from stdin, so Perl and exiftool are only loaded once per run
+    instead of once per file.
+
+    The process is started on construction; use as a context manager (or call
+    close()) to shut it down, otherwise it is shut down at interpreter exit.
+    Commands are serialized with a lock, so one instance can be shared between
+    threads. exiftool's stderr is discarded.
+    """
+
+    def __init__(self, executable='exiftool'):
+        self._executable = executable
+        self._process = subprocess.Popen(
+            [executable, '-stay_open', 'True', '-@', '-'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self._lock = threading.Lock()
+        self._counter = 0
+        
+        # Don't leave exiftool running if the script exits without closing it
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def execute(self, args):
+        """
+        Run one exiftool command and return its output.
+
+        Args:
+            args: List of exiftool arguments, e.g. ['-Make', 'photo.jpg']
+
+        Returns:
+            str: Everything exiftool printed to stdout for this command
+        """
+        return self.execute_raw(args).decode('utf-8')
+
+    def execute_raw(self, args):
+        """Run one exiftool command and return its stdout as undecoded bytes."""
+        args = [str(arg) for arg in args]
+        if any('\n' in arg or '\r' in arg for arg in args):
+            # Arguments reach the daemon one per line, so a line break in a
+            # filename would smuggle extra options into the command. Such
+            # commands get their own process, with each argument in argv.
+            return self._execute_once(args)
+        
+        with self._lock:
+            # Number each command so its {readyN} sentinel can't be confused with another's
+            self._counter += 1
+            sentinel = f'{{ready{self._counter}}}'.encode()
+            command = ''.join(f'{arg}\n' for arg in args) + f'-execute{self._counter}\n'
+            self._process.stdin.write(command.encode('utf-8'))
+            self._process.stdin.flush()
+
+            output = b''
+            while not output.rstrip().endswith(sentinel):
+                chunk = self._process.stdout.read1(65536)
+                if not chunk:
+                    raise RuntimeError("exiftool exited unexpectedly")
+                output += chunk
+
+        return output.rstrip()[:-len(sentinel)]
+
+    def _execute_once(self, args):
+        """Run one exiftool command in a new process and return its stdout."""
+        result = subprocess.run(
+            [self._executable] + args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        return result.stdout.rstrip()
+
+    def execute_json(self, args):
+        """
+        Run one exiftool command with JSON output.
+        Returns the parsed list of per-file dicts, empty if no file could be read.
+        """
+        output = self.execute_raw(['-j'] + list(args))
+        if not output.strip():
+            return []
+        return json_loads(output)
+
+    def close(self):
+        """Ask exiftool to exit and wait for it."""
+        if self._process.poll() is not None:
+            return
+        try:
+            self._process.stdin.write(b'-stay_open\nFalse\n')
+            self._process.stdin.flush()
+            self._process.stdin.close()
+            self._process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+            self._process.wait()
+
+class ExifToolPool:
+    """
+    A fixed set of ExifToolDaemon processes used round-robin, so worker
+    threads don't all queue behind a single exiftool process.
+
+    Has the same execute()/execute_json()/close() interface as ExifToolDaemon.
+    """
+
+    def __init__(self, size=EXIFTOOL_PROCESSES, executable='exiftool'):
+        self._daemons = []
+        try:
+            for _ in range(size):
+                self._daemons.append(ExifToolDaemon(executable))
+        except OSError:
+            self.close()
+            raise
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _pick(self):
+        with self._lock:
+            daemon = self._daemons[self._next]
+            self._next = (self._next + 1) % len(self._daemons)
+        return daemon
+
+    def execute(self, args):
+        """Run one exiftool command on the next daemon and return its output."""
+        return self._pick().execute(args)
+
+    def execute_raw(self, args):
+        """Run one exiftool command on the next daemon and return its stdout as bytes."""
+        return self._pick().execute_raw(args)
+
+    def execute_json(self, args):
+        """Run one exiftool command with JSON output on the next daemon."""
+        return self._pick().execute_json(args)
+
+    def close(self):
+        """Shut down every daemon in the pool."""
+        for daemon in self._daemons:
+            daemon.close()
+
+# One lock per target directory, held while choosing a filename there and moving
+# a file in, so two workers can't claim the same name or compare against a
+# half-copied file. Different directories are filled concurrently.
+_dir_locks = defaultdict(threading.Lock)
+_dir_locks_guard = threading.Lock()
+
+@contextmanager
+def target_dir_lock(target_dir):
+    """
+    Serialize filename generation and the move into target_dir across worker threads.
+    """
+    # Absolute, so relative and absolute spellings of a directory share a lock
+    key = os.path.abspath(target_dir)
+    with _dir_locks_guard:
+        lock = _dir_locks[key]
+    with lock:
+        yield
+
+# Output directories already created during this run, so the many files that
+# land in the same day directory don't each repeat the mkdir calls
+_created_dirs = set()
+_created_dirs_lock = threading.Lock()
+
+def make_dirs(directory):
+    """
+    Create directory and its parents unless this run already created it.
+    """
+    key = os.path.normpath(str(directory))
+    if key in _created_dirs:
+        return
+    os.makedirs(key, exist_ok=True)
+    with _created_dirs_lock:
+        _created_dirs.add(key)
+
+class HashCache:
+    """
+    Content fingerprints keyed by absolute path, persisted in SQLite so re-runs
+    don't re-read files that haven't changed.
+
+    A row is only used while the file's size and mtime still match and it was
+    written with the current fingerprint algorithm. A single connection is
+    shared by all worker threads behind a lock. If the database can't be
+    opened the cache is simply disabled.
+
+    The same database also records where earlier runs organized each input
+    photo, keyed the same way, so a file that is imported again can be
+    checked against its earlier copy without reading its metadata.
+    """
+
+    # Commit after this many new fingerprints, so a crash loses little work
+    COMMIT_INTERVAL = 100
+
+    def __init__(self, cache_file):
+        self.cache_file = Path(cache_file)
+        self._connection = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def open(self):
+        """Open (creating if needed) the cache database."""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.cache_file, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+                "algorithm TEXT, fingerprint TEXT)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS processed ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+                "target_path TEXT, processed_at TEXT)"
+            )
+            connection.commit()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Hash cache disabled, could not open {self.cache_file}: {str(e)}")
+            return
+        with self._lock:
+            self._connection = connection
+
+    def close(self):
+        """Commit outstanding fingerprints and close the database."""
+        with self._lock:
+            if self._connection is None:
+                return
+            try:
+                self._connection.commit()
+                self._connection.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not save hash cache {self.cache_file}: {str(e)}")
+            self._connection = None
+
+    def get(self, path, size, mtime_ns):
+        """Return the cached fingerprint for path, or None if missing or stale."""
+        with self._lock:
+            if self._connection is None:
+                return None
+            try:
+                row = self._connection.execute(
+                    "SELECT fingerprint FROM hashes "
+                    "WHERE path = ? AND size = ? AND mtime_ns = ? AND algorithm = ?",
+                    (path, size, mtime_ns, FINGERPRINT_NAME)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.debug(f"Hash cache lookup failed for {path}: {str(e)}")
+                return None
+        return row[0] if row else None
+
+    def put(self, path, size, mtime_ns, fingerprint):
+        """Remember the fingerprint of path at the given size and mtime."""
+        with self._lock:
+            if self._connection is None:
+                return
+            try:
+                self._connection.execute(
+                    "INSERT INTO hashes (path, size, mtime_ns, algorithm, fingerprint) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET size = excluded.size, "
+                    "mtime_ns = excluded.mtime_ns, algorithm = excluded.algorithm, "
+                    "fingerprint = excluded.fingerprint",
+                    (path, size, mtime_ns, FINGERPRINT_NAME, fingerprint)
+                )
+                self._commit_if_due()
+            except sqlite3.Error as e:
+                logger.debug(f"Hash cache update failed for {path}: {str(e)}")
+
+    def get_processed(self, path, size, mtime_ns):
+        """
+        Return where an earlier run organized the input file at path, or None
+        if it wasn't recorded with this size and mtime.
+        """
+        with self._lock:
+            if self._connection is None:
+                return None
+            try:
+                row = self._connection.execute(
+                    "SELECT target_path FROM processed "
+                    "WHERE path = ? AND size = ? AND mtime_ns = ?",
+                    (path, size, mtime_ns)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.debug(f"Processed index lookup failed for {path}: {str(e)}")
+                return None
+        return row[0] if row else None
+
+    def put_processed(self, path, size, mtime_ns, target_path):
+        """Remember that the input file at path was organized as target_path."""
+        with self._lock:
+            if self._connection is None:
+                return
+            try:
+                self._connection.execute(
+                    "INSERT INTO processed (path, size, mtime_ns, target_path, processed_at) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET size = excluded.size, "
+                    "mtime_ns = excluded.mtime_ns, target_path = excluded.target_path, "
+                    "processed_at = excluded.processed_at",
+                    (path, size, mtime_ns, target_path, datetime.now().isoformat(timespec='seconds'))
+                )
+                self._commit_if_due()
+            except sqlite3.Error as e:
+                logger.debug(f"Processed index update failed for {path}: {str(e)}")
+
+    def _commit_if_due(self):
+        """Commit once COMMIT_INTERVAL rows are pending; called with the lock held."""
+        self._pending += 1
+        if self._pending >= self.COMMIT_INTERVAL:
+            self._connection.commit()
+            self._pending = 0
+
+hash_cache = HashCache(HASH_CACHE_FILE)
+
+def file_fingerprint(file_path: Path, stat_result=None) -> str:
+    """
+    Return a fast content fingerprint of a file, using the hash cache when
+    the file hasn't changed since it was last fingerprinted.
+    """
+    if stat_result is None:
+        stat_result = file_path.stat()
+    key = os.path.abspath(file_path)
+    fingerprint = hash_cache.get(key, stat_result.st_size, stat_result.st_mtime_ns)
+    if fingerprint is None:
+        with open(file_path, 'rb') as f:
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            if stat_result.st_size >= MMAP_FINGERPRINT_SIZE:
+                # Hash the mapping directly, saving the copy into a read buffer
+                hasher = new_fingerprint()
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    hasher.update(mm)
+            elif hasattr(hashlib, 'file_digest'):
+                # Python 3.11+: reads into one reused buffer, without the GIL
+                hasher = hashlib.file_digest(f, new_fingerprint)
+            else:
+                hasher = new_fingerprint()
+                while True:
+                    data = f.read(COMPARE_BUFFER_SIZE)
+                    if not data:
+                        break
+                    hasher.update(data)
+        fingerprint = hasher.hexdigest()
+        hash_cache.put(key, stat_result.st_size, stat_result.st_mtime_ns, fingerprint)
+    return fingerprint
+
 def get_base_output_dir(file_extension):
     """Determine the base output directory based on file type."""
     if file_extension.lower() in JPG_EXTENSIONS:
@@ -110,42 +660,83 @@ def ensure_directories_exist():
     ]
     
     for directory in directories:
-        os.makedirs(directory, exist_ok=True)
+        make_dirs(directory)
 
-def get_shutter_count(file_path):
+def read_all_metadata(file_path, exiftool):
     """
-    Extract shutter count from EXIF data using exiftool.
-    Returns None if not found.
+    Read every tag in ALL_TAGS for a file with a single exiftool command.
+    
+    Returns:
+        dict: exiftool's JSON entry for the file (includes 'SourceFile'),
+              or an empty dict if the file could not be read
     """
     try:
-        # Create command with all possible shutter count tags
-        tag_args = []
-        for tag in SHUTTER_COUNT_TAGS:
-            # For exiftool, we need to format the tag differently
-            formatted_tag = tag.replace(' ', ':')
-            tag_args.extend(['-' + formatted_tag])
+        args = METADATA_OPTIONS + ALL_TAGS + [str(file_path)]
+        logger.debug(f"Executing exiftool command: {' '.join(args)}")
+        data = exiftool.execute_json(args)
+        if not data:
+            logger.warning(f"Failed to read EXIF data for {file_path}")
+            return {}
+        return data[0]
+    except Exception as e:
+        logger.error(f"Error reading EXIF data from {file_path}: {str(e)}")
+        return {}
+
+def iter_metadata_batches(file_paths, exiftool):
+    """
+    Read metadata for many files with as few exiftool commands as possible,
+    yielding each batch as soon as exiftool returns it.
+    
+    Files are sent in batches of EXIFTOOL_BATCH_SIZE. The daemon reads its
+    arguments from stdin, so a batch is not limited by ARG_MAX.
+    
+    Args:
+        file_paths: Paths of the files to read; may be a lazy iterable
+        exiftool: Running ExifToolDaemon or ExifToolPool
         
-        cmd = ['exiftool', '-j'] + tag_args + [str(file_path)]
-        logger.debug(f"Executing exiftool command: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True)
+    Yields:
+        list: (Path, metadata dict or None) for every file in the batch,
+              with None for files exiftool could not read
+    """
+    file_paths = iter(file_paths)
+    while True:
+        batch = list(islice(file_paths, EXIFTOOL_BATCH_SIZE))
+        if not batch:
+            break
+        metadata = {}
+        try:
+            data = exiftool.execute_json(METADATA_OPTIONS + ALL_TAGS + [str(path) for path in batch])
+        except Exception as e:
+            logger.error(f"Error reading EXIF data for batch of {len(batch)} files: {str(e)}")
+            data = []
         
-        if result.returncode != 0:
-            logger.debug(f"Exiftool returned error: {result.stderr}")
-            return None
+        # Index by SourceFile so results can be matched back to their files
+        for entry in data:
+            source_file = entry.get('SourceFile')
+            if source_file:
+                metadata[Path(source_file)] = entry
+        
+        logger.debug(f"Read metadata for {len(metadata)} of {len(batch)} files")
+        yield [(path, metadata.get(path)) for path in batch]
 
-        data = json.loads(result.stdout)
-        if not data:
+def get_shutter_count(metadata):
+    """
+    Extract shutter count from metadata read by read_all_metadata.
+    Returns None if not found.
+    """
+    try:
+        if not metadata:
             logger.debug("No EXIF data found")
             return None
 
         # Try each possible shutter count tag
         for tag in SHUTTER_COUNT_TAGS:
-            count = data[0].get(tag)
+            count = metadata.get(tag)
             logger.debug(f"Checking tag {tag}: {count}")
             if count:
                 # Try to extract number if it's a string (like in serial numbers)
                 if isinstance(count, str):
-                    matches = re.findall(r'\d+', count)
+                    matches = DIGIT_RUN.findall(count)
                     if matches:
                         count = matches[-1]  # Take the last number group
                 try:
@@ -156,29 +747,18 @@ def get_shutter_count(file_path):
         logger.debug("No shutter count found in any tag")
         return None
     except Exception as e:
-        logger.error(f"Error reading shutter count from {file_path}: {str(e)}")
+        logger.error(f"Error reading shutter count from {metadata.get('SourceFile')}: {str(e)}")
         return None
 
-def get_exif_creation_date(file_path):
+def get_exif_creation_date(metadata):
     """
-    Extract creation date from EXIF data using exiftool.
+    Extract creation date from metadata read by read_all_metadata.
     Returns None if date is unrealistic or not found.
     """
+    file_path = metadata.get('SourceFile')
     try:
         # Try to get CreateDate, if not available, try DateTimeOriginal
-        cmd = ['exiftool', '-CreateDate', '-DateTimeOriginal', '-j', file_path]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            logger.warning(f"Failed to read EXIF data for {file_path}")
-            return None
-
-        data = json.loads(result.stdout)
-        if not data:
-            return None
-
-        # Try different date fields
-        date_str = data[0].get('CreateDate') or data[0].get('DateTimeOriginal')
+        date_str = metadata.get('CreateDate') or metadata.get('DateTimeOriginal')
         
         if not date_str:
             return None
@@ -199,13 +779,13 @@ def get_exif_creation_date(file_path):
             return None
         
         # Check if date is realistic
-        if dt.strftime('%Y-%m-%d') in UNREALISTIC_DATES:
+        if (dt.year, dt.month, dt.day) in UNREALISTIC_DATE_TUPLES:
             logger.warning(f"Unrealistic date found in EXIF: {dt} for {file_path}")
             return None
             
         # Additional validation for year
-        if dt.year < MIN_VALID_YEAR or dt.year > datetime.now().year:
-            logger.debug(f"Year {dt.year} outside valid range ({MIN_VALID_YEAR}-{datetime.now().year})")
+        if dt.year < MIN_VALID_YEAR or dt.year > _CURRENT_YEAR:
+            logger.debug(f"Year {dt.year} outside valid range ({MIN_VALID_YEAR}-{_CURRENT_YEAR})")
             return None
             
         return dt
@@ -213,6 +793,28 @@ def get_exif_creation_date(file_path):
         logger.error(f"Error reading EXIF data from {file_path}: {str(e)}")
         return None
 
+def _validate_ymdhms(year, month, day, hour, minute, second, current_year):
+    """
+    Check date and time components parsed from a filename.
+    
+    Returns:
+        bool: True if the fields form a real date and time, the year is between MIN_VALID_YEAR
+              and current_year, and the date isn't one of UNREALISTIC_DATES
+    """
+    if not (MIN_VALID_YEAR <= year <= current_year):
+        logger.debug(f"Year {year} outside valid range ({MIN_VALID_YEAR}-{current_year})")
+        return False
+    if not (1 <= month <= 12 and 1 <= day <= _DAYS_IN_MONTH[month - 1]):
+        return False
+    if month == 2 and day == 29 and not (year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)):
+        return False
+    if not (0 <= hour <= 23 and 0 <= minute <= 59 and 0 <= second <= 59):
+        return False
+    if (year, month, day) in UNREALISTIC_DATE_TUPLES:
+        logger.debug(f"Unrealistic date found in filename: {year:04d}-{month:02d}-{day:02d}")
+        return False
+    return True
+
 def extract_date_from_filename(filename: str) -> Optional[datetime]:
     """
     Try to extract date from filename using various patterns.
@@ -228,131 +830,47 @@ def extract_date_from_filename(filename: str) -> Optional[datetime]:
     - YYYY-MM-DD
     - DD-MM-YYYY
     """
-    # Ensure current_year is always defined
-    current_year: int = datetime.now().year
-
     # Validate input
     if not filename or not isinstance(filename, str):
         logger.debug(f"Invalid filename: {filename}")
         return None
 
-    # Date patterns to match
-    patterns = [
-        # Full datetime patterns
-        r'(\d{4})-(\d{2})-(\d{2})-(\d{2})-(\d{2})-(\d{2})',  # YYYY-MM-DD-HH-MM-SS
-        r'(\d{2})-(\d{2})-(\d{4})-(\d{2})-(\d{2})-(\d{2})',  # DD-MM-YYYY-HH-MM-SS
-        r'(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})',      # YYYYMMDD_HHMMSS
-        r'(\d{4})-(\d{2})-(\d{2})_(\d{2})-(\d{2})-(\d{2})',  # YYYY-MM-DD_HH-MM-SS
-        r'(\d{4})_(\d{2})_(\d{2})_(\d{2})_(\d{2})_(\d{2})',  # YYYY_MM_DD_HH_MM_SS
-        r'(\d{2})-(\d{2})-(\d{4})_(\d{2})(\d{2})(\d{2})',    # DD-MM-YYYY_HHMMSS
-        r'(\d{8})-(\d{6})',                                  # YYYYMMDD-HHMMSS
-        r'(\d{12})',                                         # YYYYMMDDHHMMSS
-        
-        # Date-only patterns
-        r'(\d{4})-(\d{2})-(\d{2})',                          # YYYY-MM-DD
-        r'(\d{2})-(\d{2})-(\d{4})'                           # DD-MM-YYYY
-    ]
+    # Most filenames contain no date at all
+    if not FILENAME_DATE_ANY.search(filename):
+        return None
 
-    # Try each pattern
-    for pattern in patterns:
-        match = re.search(pattern, filename)
+    # Try each pattern in priority order; a later pattern is still tried
+    # when an earlier match fails validation
+    for pattern, layout in FILENAME_DATE_PATTERNS:
+        match = pattern.search(filename)
         
         if match:
-            try:
-                groups = match.groups()
-            except Exception as e:
-                logger.debug(f"Error extracting groups from filename {filename}: {e}")
-                continue
-
-            try:
-                # Initialize variables with default values
-                year = month = day = hour = minute = second = None
-
-                # Handle full datetime patterns
-                if len(groups) == 6:  # Full datetime pattern
-                    if len(groups[0]) == 4:  # YYYY-MM-DD-HH-MM-SS
-                        year, month, day, hour, minute, second = groups
-                    else:  # DD-MM-YYYY-HH-MM-SS
-                        day, month, year, hour, minute, second = groups
-                
-                # Handle YYYYMMDDHHMMSS format
-                elif len(groups) == 1:  # YYYYMMDDHHMMSS format
-                    date_str = groups[0]
-                    year = date_str[:4]
-                    month = date_str[4:6]
-                    day = date_str[6:8]
-                    hour = date_str[8:10]
-                    minute = date_str[10:12]
-                    second = "00"
-                
-                # Handle YYYYMMDD-HHMMSS format
-                elif len(groups) == 2:  # YYYYMMDD-HHMMSS format
-                    date_str, time_str = groups
-                    year = date_str[:4]
-                    month = date_str[4:6]
-                    day = date_str[6:8]
-                    hour = time_str[:2]
-                    minute = time_str[2:4]
-                    second = time_str[4:6]
-                
-                # Handle date-only patterns
-                elif len(groups) == 3:
-                    if len(groups[0]) == 4:  # YYYY-MM-DD
-                        year, month, day = groups
-                        hour, minute, second = "00", "00", "00"
-                    else:  # DD-MM-YYYY
-                        day, month, year = groups
-                        hour, minute, second = "00", "00", "00"
-            except Exception as e:
-                logger.debug(f"Error processing date groups from filename {filename}: {e}")
-                continue
-
-            # Explicit type conversion and validation
-            try:
-                # Ensure all components are strings before conversion
-                year = str(year).strip()
-                month = str(month).strip()
-                day = str(day).strip()
-                hour = str(hour).strip() or "00"
-                minute = str(minute).strip() or "00"
-                second = str(second).strip() or "00"
-                
-                # Convert to integers
-                year_int = int(year)
-                month_int = int(month)
-                day_int = int(day)
-                hour_int = int(hour)
-                minute_int = int(minute)
-                second_int = int(second)
-                
-                # Basic validation
-                if not (MIN_VALID_YEAR <= year_int <= current_year):
-                    logger.debug(f"Year {year_int} outside valid range ({MIN_VALID_YEAR}-{current_year})")
-                    continue
-                if not (1 <= month_int <= 12):
-                    continue
-                if not (1 <= day_int <= 31):
-                    continue
-                if not (0 <= hour_int <= 23):
-                    continue
-                if not (0 <= minute_int <= 59):
-                    continue
-                if not (0 <= second_int <= 59):
-                    continue
-                
-                # Create datetime object
-                dt = datetime(year_int, month_int, day_int, hour_int, minute_int, second_int)
-                
-                # Additional validation for unrealistic dates
-                if dt.strftime('%Y-%m-%d') in UNREALISTIC_DATES:
-                    logger.debug(f"Unrealistic date found in filename: {dt.strftime('%Y-%m-%d')}")
-                    continue
-                
-                return dt
-            
-            except (ValueError, TypeError) as e:
-                logger.debug(f"Error parsing date from filename {filename}: {e}")
-                continue
+            groups = match.groups()
+
+            # Map the captured groups onto date and time fields
+            if layout == 'ymd_hms':    # YYYY MM DD HH MM SS
+                year, month, day, hour, minute, second = groups
+            elif layout == 'dmy_hms':  # DD MM YYYY HH MM SS
+                day, month, year, hour, minute, second = groups
+            elif layout == 'date8_time6':  # YYYYMMDD-HHMMSS
+                date_str, time_str = groups
+                year, month, day = date_str[:4], date_str[4:6], date_str[6:8]
+                hour, minute, second = time_str[:2], time_str[2:4], time_str[4:6]
+            elif layout == 'digits12':    # YYYYMMDDHHMM
+                date_str = groups[0]
+                year, month, day = date_str[:4], date_str[4:6], date_str[6:8]
+                hour, minute, second = date_str[8:10], date_str[10:12], "00"
+            elif layout == 'ymd':      # YYYY-MM-DD
+                year, month, day = groups
+                hour, minute, second = "00", "00", "00"
+            else:                      # DD-MM-YYYY
+                day, month, year = groups
+                hour, minute, second = "00", "00", "00"
+
+            # Convert to integers and validate them; only a valid date becomes a datetime
+            components = (int(year), int(month), int(day), int(hour), int(minute), int(second))
+            if _validate_ymdhms(*components, _CURRENT_YEAR):
+                return datetime(*components)
     
     return None
 
@@ -365,14 +883,15 @@ def to_camel_case(s):
     - nikon-corporation-nikon-d5100
     """
     # Remove non-alphanumeric characters and split
-    words = re.findall(r'[a-zA-Z]+|\d+', s)
+    words = CAMEL_CASE_TOKEN.findall(s)
     
     # Capitalize each word except the first
     if not words:
         return s
     
     # Special case for Apple/iPhone
-    if any('apple' in word.lower() for word in words) or any('iphone' in word.lower() for word in words):
+    lowered = s.lower()
+    if 'apple' in lowered or 'iphone' in lowered:
         return 'Apple' + 'iPhone' + ''.join(word for word in words[2:])
     
     # Capitalize corporation names, keep model numbers as-is
@@ -387,34 +906,34 @@ def to_camel_case(s):
     
     return camel_case
 
+@lru_cache(maxsize=1024)
 def clean_make(make):
-    """Clean up camera make string."""
+    """Clean up camera make string. Cached, since most files repeat a few makes."""
     if not make:
         return ''
         
     # Hardcoded make names
-    if make.lower() == 'sonyericsson':
-        return 'SonyEricsson'
-    elif make.lower() in ['pentaxcorporation', 'pentax', 'pentax corporation']:
-        return 'Pentax'
-    elif make.lower() in ['nikoncorporation', 'nikon', 'nikon corporation']:
-        return 'Nikon'
+    lowered = make.lower()
+    override = MAKE_OVERRIDES.get(lowered)
+    if override:
+        return override
     
     # Remove 'Corporation' if present
-    if 'corporation' in make.lower():
+    if 'corporation' in lowered:
         make = make.replace('Corporation', '').strip()
     
     # Remove spaces, dashes, and special characters
-    make = re.sub(r'[^a-zA-Z0-9]', '', make)
+    make = NON_ALPHANUMERIC.sub('', make)
     
     # Convert to camel case if not already hardcoded
-    if make not in ['SonyEricsson', 'Pentax', 'Nikon', 'Sony', 'Apple']:
+    if make not in HARDCODED_MAKES:
         make = to_camel_case(make)
     
     return make
 
+@lru_cache(maxsize=1024)
 def clean_model(model, make):
-    """Clean up camera model string."""
+    """Clean up camera model string. Cached, since most files repeat a few models."""
     if not model:
         return ''
     
@@ -422,25 +941,19 @@ def clean_model(model, make):
     if make and model.lower().startswith(make.lower()):
         model = model[len(make):].strip()
     
-    # Replace spaces with dashes
-    model = model.replace(' ', '-')
-    
-    # Replace forward slashes and backslashes with dashes
-    model = model.replace('/', '-').replace('\\', '-')
-    
-    # Replace other potentially problematic characters
-    model = model.replace(',', '_').replace('(', '').replace(')', '')
+    # Spaces and slashes become dashes, commas underscores, parentheses are dropped
+    model = model.translate(MODEL_TRANSLATION)
     
     # Hardcoded rules for specific cameras
     if make == 'Nikon':
         # If it's a D series camera, ensure format is "NIKON-D####"
-        if re.search(r'D\d{3,4}', model, re.IGNORECASE):
-            d_number = re.search(r'D\d{3,4}', model, re.IGNORECASE).group(0)
-            return f"NIKON-{d_number.upper()}"
+        match = NIKON_D_MODEL.search(model)
+        if match:
+            return f"NIKON-{match.group(0).upper()}"
         # For Z series
-        elif re.search(r'Z\d{1,2}', model, re.IGNORECASE):
-            z_number = re.search(r'Z\d{1,2}', model, re.IGNORECASE).group(0)
-            return f"NIKON-{z_number.upper()}"
+        match = NIKON_Z_MODEL.search(model)
+        if match:
+            return f"NIKON-{match.group(0).upper()}"
     elif make == 'Sony':
         if model.upper().startswith('ILCE'):
             return model.upper()  # Keep Sony model numbers in uppercase
@@ -451,28 +964,17 @@ def clean_model(model, make):
     
     return model
 
-def get_camera_info(file_path):
+def get_camera_info(metadata):
     """
-    Extract camera make and model from EXIF data.
-    Returns tuple (make, model) or (None, None) if not found.
+    Extract camera make and model from metadata read by read_all_metadata.
+    Returns tuple (make, model) or ('', '') if not found.
     
     Includes hardcoded rules for specific cameras.
     """
     try:
-        # Run exiftool and get JSON output
-        result = subprocess.run(
-            ['exiftool', '-j', '-Make', '-Model', str(file_path)],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        
-        # Parse JSON output
-        exif_data = json.loads(result.stdout)[0]
-        
         # Get make and model
-        make = exif_data.get('Make', '').strip()
-        model = exif_data.get('Model', '').strip()
+        make = metadata.get('Make', '').strip()
+        model = metadata.get('Model', '').strip()
         
         # Clean up make and model
         make = clean_make(make)
@@ -480,51 +982,25 @@ def get_camera_info(file_path):
         
         return make, model
         
-    except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError) as e:
-        logger.error(f"Error getting camera info for {file_path}: {str(e)}")
+    except (AttributeError, KeyError) as e:
+        logger.error(f"Error getting camera info for {metadata.get('SourceFile')}: {str(e)}")
         return '', ''
 
-def is_likely_photo(file_path):
+def is_likely_photo(metadata):
     """
-    Determine if an image is likely a photo based on multiple criteria.
+    Determine if an image is likely a photo based on multiple criteria,
+    using metadata read by read_all_metadata.
     
     Checks:
     - Camera metadata
     - Image dimensions
     - Potential non-photo indicators
     """
+    file_path = metadata.get('SourceFile')
     try:
-        # Use ExifTool to get comprehensive image information
-        cmd = ['exiftool', 
-               '-FileType', 
-               '-Make', 
-               '-Model', 
-               '-Software', 
-               '-ImageWidth', 
-               '-ImageHeight', 
-               '-ColorSpace',
-               '-Compression',
-               '-j', 
-               str(file_path)
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            logger.warning(f"ExifTool failed for {file_path}")
-            return False
-
-        try:
-            data = json.loads(result.stdout)
-        except json.JSONDecodeError:
-            logger.warning(f"Failed to parse ExifTool output for {file_path}")
-            return False
-
-        if not data or len(data) == 0:
+        if not metadata:
             logger.warning(f"No metadata found for {file_path}")
             return False
-
-        # Extract relevant metadata
-        metadata = data[0]
         
         # Check for camera metadata
         make = metadata.get('Make', '').strip()
@@ -539,19 +1015,6 @@ def is_likely_photo(file_path):
         color_space = metadata.get('ColorSpace', '').lower()
         compression = metadata.get('Compression', '').lower()
         
-        # Non-photo indicators
-        non_photo_software = [
-            'photoshop',
-            'illustrator',
-            'inkscape',
-            'gimp',
-            'paint',
-            'sketch',
-            'figma',
-            'xd',
-            'canva'
-        ]
-        
         # Criteria for a likely photo
         is_photo = (
             # Has camera metadata
@@ -559,12 +1022,12 @@ def is_likely_photo(file_path):
             # Large enough image with reasonable dimensions
             (width > 1000 and height > 1000) or 
             # Typical photo color spaces
-            (color_space in ['srgb', 'adobe rgb', 'prophoto rgb'])
+            (color_space in PHOTO_COLOR_SPACES)
         )
         
         # Exclude if clear non-photo indicators are present
         if is_photo:
-            if any(indicator in software.lower() for indicator in non_photo_software):
+            if any(indicator in software for indicator in NON_PHOTO_SOFTWARE):
                 return False
         
         return is_photo
@@ -573,31 +1036,42 @@ def is_likely_photo(file_path):
         logger.error(f"Error checking if image is a photo {file_path}: {str(e)}")
         return False
 
-def detect_image_type(file_path):
+def _read_png_header(file_path):
+    """
+    Read the IHDR chunk at the start of a PNG file.
+    
+    Returns:
+        tuple: (width, height, bit_depth, color_type), or None if the file
+               isn't a readable PNG
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read(26)
+    except OSError:
+        return None
+    
+    # 8-byte signature, then the IHDR chunk's length and type, then its data
+    if len(data) < 26 or data[:8] != PNG_SIGNATURE or data[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>IIBB', data[16:26])
+
+def detect_image_type(metadata, file_path=None):
     """
-    Detect the type of image and categorize it.
+    Detect the type of image and categorize it, using metadata read by
+    read_all_metadata. For PNG files the dimensions, bit depth and color
+    type are read from the file header at file_path.
     
     Returns:
     - 'screenshot' if it's a screenshot
     - 'non_camera_image' for other non-camera images
     - None if it's a camera photo
     """
+    if file_path is None:
+        file_path = metadata.get('SourceFile')
     try:
-        # Get metadata using exiftool
-        cmd = ['exiftool', '-j', '-Software', '-ColorSpace', '-Compression',
-               '-ScreenCaptureType', '-FileType', '-ImageWidth', '-ImageHeight',
-               '-PNG:ColorType', '-PNG:BitDepth', str(file_path)]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            logger.debug(f"Error getting metadata: {result.stderr}")
+        if not metadata:
+            logger.debug("No metadata to detect image type from")
             return None
-            
-        data = json.loads(result.stdout)
-        if not data:
-            return None
-            
-        metadata = data[0]
         
         # Convert metadata values to strings, handling potential float values
         software = str(metadata.get('Software', '')).lower()
@@ -605,40 +1079,24 @@ def detect_image_type(file_path):
         compression = str(metadata.get('Compression', '')).lower()
         file_type = str(metadata.get('FileType', '')).lower()
         
-        # Get PNG-specific metadata
-        png_color_type = metadata.get('PNG:ColorType', '')
-        png_bit_depth = metadata.get('PNG:BitDepth', '')
-        width = metadata.get('ImageWidth', 0)
-        height = metadata.get('ImageHeight', 0)
-
         # Check for screenshot indicators
-        if any(x in software for x in ['screen', 'screenshot']):
+        if 'screen' in software:
             return 'screenshot'
 
-        # Additional checks for PNG screenshots
-        if file_type == 'png':
-            # Most screenshots are RGB/RGBA PNGs with 8-bit depth
-            # PNG:ColorType values: 0=Grayscale, 2=RGB, 3=Palette, 4=Grayscale+Alpha, 6=RGB+Alpha
-            if ((png_color_type in [2, 6] or png_color_type in ['RGB', 'RGB+Alpha']) and 
-                (png_bit_depth == 8 or png_bit_depth == '8') and
-                width >= 800):  # Common screen width threshold
-                return 'screenshot'
-
-        # List of software names that indicate non-photo images
-        non_photo_software = [
-            'photoshop',
-            'illustrator',
-            'inkscape',
-            'gimp',
-            'paint',
-            'sketch',
-            'figma',
-            'xd',
-            'canva'
-        ]
-        
+        # Additional checks for PNG screenshots, straight from the file header
+        if file_type == 'png' and file_path:
+            png_header = _read_png_header(file_path)
+            if png_header:
+                width, height, png_bit_depth, png_color_type = png_header
+                # Most screenshots are RGB/RGBA PNGs with 8-bit depth
+                # Color type values: 0=Grayscale, 2=RGB, 3=Palette, 4=Grayscale+Alpha, 6=RGB+Alpha
+                if (png_color_type in (2, 6) and
+                    png_bit_depth == 8 and
+                    width >= 800):  # Common screen width threshold
+                    return 'screenshot'
+
         # Check for software that indicates non-photo images
-        if any(indicator in software for indicator in non_photo_software):
+        if any(indicator in software for indicator in NON_PHOTO_SOFTWARE):
             return 'non_camera_image'
             
         return None
@@ -647,13 +1105,31 @@ def detect_image_type(file_path):
         logger.error(f"Error detecting image type for {file_path}: {str(e)}")
         return None
 
-def is_duplicate_file(file1_path: Path, file2_path: Path) -> bool:
+def quick_signature(file_path):
+    """
+    Return (size, hash of the first QUICK_SIGNATURE_SIZE bytes) for a file,
+    a cheap prefilter that rules out most non-duplicates without reading
+    the whole file. Returns None if the file can't be read.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            head = f.read(QUICK_SIGNATURE_SIZE)
+    except OSError as e:
+        logger.debug(f"Could not read signature of {file_path}: {str(e)}")
+        return None
+    return size, hashlib.blake2b(head, digest_size=16).digest()
+
+def is_duplicate_file(file1_path: Path, file2_path: Path, fingerprint1=None) -> bool:
     """
-    Check if two files are identical by comparing size and content.
+    Check if two files are identical by comparing size, then a cached content
+    fingerprint, then the content itself.
     
     Args:
         file1_path: Path to first file
         file2_path: Path to second file
+        fingerprint1: Already computed fingerprint of the first file, for
+            callers comparing one file against several others
         
     Returns:
         bool: True if files are identical, False otherwise
@@ -667,47 +1143,138 @@ def is_duplicate_file(file1_path: Path, file2_path: Path) -> bool:
         return False
         
     # First check if file sizes match
-    size1 = file1_path.stat().st_size
-    size2 = file2_path.stat().st_size
+    stat1 = file1_path.stat()
+    stat2 = file2_path.stat()
+    size1 = stat1.st_size
+    size2 = stat2.st_size
     logger.debug(f"  Size comparison: {size1} vs {size2}")
     if size1 != size2:
         logger.debug("  Files have different sizes")
         return False
         
-    # Compare file contents using SHA-256 hash
-    BUFFER_SIZE = 65536  # 64kb chunks
-    
-    sha256_1 = hashlib.sha256()
-    sha256_2 = hashlib.sha256()
-    
     try:
-        with open(file1_path, 'rb') as f1:
-            while True:
-                data = f1.read(BUFFER_SIZE)
-                if not data:
-                    break
-                sha256_1.update(data)
-                
-        with open(file2_path, 'rb') as f2:
-            while True:
-                data = f2.read(BUFFER_SIZE)
-                if not data:
-                    break
-                sha256_2.update(data)
-                
-        hash1 = sha256_1.digest()
-        hash2 = sha256_2.digest()
-        logger.debug(f"  Hash comparison: {hash1.hex()} vs {hash2.hex()}")
-        are_identical = hash1 == hash2
-        logger.debug(f"  Files are {'identical' if are_identical else 'different'}")
-        return are_identical
+        # Different fingerprints mean different content
+        if fingerprint1 is None:
+            fingerprint1 = file_fingerprint(file1_path, stat1)
+        fingerprint2 = file_fingerprint(file2_path, stat2)
+        logger.debug(f"  Fingerprint comparison: {fingerprint1} vs {fingerprint2}")
+        if fingerprint1 != fingerprint2:
+            logger.debug("  Files are different")
+            return False
+        
+        # Empty files can't be mapped, and are trivially identical
+        if size1 == 0:
+            logger.debug("  Files are identical")
+            return True
+        
+        # Compare the mapped contents chunk by chunk, stopping at the first difference.
+        # Slices of an mmap are bytes, so each comparison is a single memcmp.
+        with open(file1_path, 'rb') as f1, open(file2_path, 'rb') as f2, \
+                mmap.mmap(f1.fileno(), 0, access=mmap.ACCESS_READ) as mm1, \
+                mmap.mmap(f2.fileno(), 0, access=mmap.ACCESS_READ) as mm2:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm1.madvise(mmap.MADV_SEQUENTIAL)
+                mm2.madvise(mmap.MADV_SEQUENTIAL)
+            for offset in range(0, size1, COMPARE_BUFFER_SIZE):
+                end = offset + COMPARE_BUFFER_SIZE
+                if mm1[offset:end] != mm2[offset:end]:
+                    logger.debug("  Files are different")
+                    return False
+        logger.debug("  Files are identical")
+        return True
     except Exception as e:
         logger.error(f"Error comparing files: {str(e)}")
         return False
 
-def process_photo(file_path):
+def clone_file(source_path, target_path):
+    """
+    Create target_path as a reflink (FICLONE) of source_path and copy its
+    metadata. This shares the data blocks instead of copying them, and works
+    across btrfs subvolumes and other same-filesystem boundaries that rename
+    refuses.
+    
+    Returns:
+        bool: True if the clone was made, False if it isn't supported here
+    """
+    if fcntl is None or FICLONE is None:
+        return False
+    try:
+        with open(source_path, 'rb') as src, open(target_path, 'xb') as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            except OSError:
+                dst.close()
+                os.remove(target_path)
+                return False
+        shutil.copystat(source_path, target_path)
+        return True
+    except OSError as e:
+        logger.debug(f"Could not clone {source_path}: {str(e)}")
+        return False
+
+def copy_file(source_path, target_path):
+    """
+    Copy a file and its metadata to target_path, like shutil.copy2.
+    
+    On Linux the data is moved with os.copy_file_range, which stays in the
+    kernel and lets filesystems that support it (NFS, SMB, XFS) copy on the
+    server or share blocks. Elsewhere, or when the kernel refuses it for this
+    pair of files, the copy is left to shutil, which already uses sendfile
+    or fcopyfile where it can.
+    """
+    if not hasattr(os, 'copy_file_range'):
+        shutil.copy2(source_path, target_path)
+        return
+    
+    with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+        in_fd, out_fd = src.fileno(), dst.fileno()
+        remaining = os.fstat(in_fd).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(in_fd, out_fd, min(remaining, COPY_CHUNK_SIZE))
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError as e:
+            # Both file offsets have advanced past what was copied, so the
+            # fallback picks up where the kernel copy stopped
+            logger.debug(f"copy_file_range failed, copying in userspace: {str(e)}")
+        shutil.copyfileobj(src, dst, COMPARE_BUFFER_SIZE)
+    shutil.copystat(source_path, target_path)
+
+def move_file(source_path, target_path):
+    """
+    Move a file to target_path, keeping its metadata.
+    
+    Tries, in order: a rename when source and target directory are on the
+    same device, a reflink clone, and finally copy_file. The original is
+    removed after a clone or copy. A symlinked source is never renamed, so
+    the link's target content ends up in the output rather than the link.
+    """
+    try:
+        same_device = (
+            not os.path.islink(source_path)
+            and os.stat(source_path).st_dev == os.stat(Path(target_path).parent).st_dev
+        )
+    except OSError:
+        same_device = False
+    
+    if same_device:
+        try:
+            os.replace(source_path, target_path)
+            return
+        except OSError as e:
+            logger.debug(f"Rename failed, copying instead: {str(e)}")
+    
+    if not clone_file(source_path, target_path):
+        copy_file(source_path, target_path)
+    os.remove(source_path)  # Remove original file after successful copy
+
+def process_photo(file_path, exiftool, metadata=None):
     """
     Process a photo file, organizing it based on its metadata and type.
+    Uses the metadata pre-fetched by iter_metadata_batches when given, otherwise
+    reads it through the shared ExifToolDaemon.
     
     Handles different image types:
     - Camera photos (with EXIF data)
@@ -726,14 +1293,18 @@ def process_photo(file_path):
         if file_extension not in SUPPORTED_EXTENSIONS:
             return False
 
+        # Read all metadata with a single exiftool command unless pre-fetched
+        if metadata is None:
+            metadata = read_all_metadata(file_path, exiftool)
+        
         # Detect image type
-        image_type = detect_image_type(file_path)
+        image_type = detect_image_type(metadata, file_path)
         
         # Extract date from EXIF or filename
-        file_date = extract_date(file_path)
+        file_date = extract_date(file_path, metadata, exiftool)
         
         # Get camera information for photos
-        camera_make, camera_model = get_camera_info(file_path)
+        camera_make, camera_model = get_camera_info(metadata)
 
         if image_type == 'screenshot':
             # Process screenshot
@@ -757,18 +1328,18 @@ def process_photo(file_path):
             else:
                 new_filename = pad_numbers_in_filename(file_path.name)
             
-            target_dir, unique_filename, is_duplicate = generate_unique_filename(
-                target_dir, new_filename, file_path, use_dashes=True
-            )
-            
-            if is_duplicate:
-                logger.info(f"Duplicate screenshot found, skipping: {file_path}")
-                os.remove(file_path)  # Remove duplicate file
-                return True
+            with target_dir_lock(target_dir):
+                target_dir, unique_filename, is_duplicate = generate_unique_filename(
+                    target_dir, new_filename, file_path, use_dashes=True
+                )
                 
-            target_path = target_dir / unique_filename
-            shutil.copy2(file_path, target_path)
-            os.remove(file_path)  # Remove original file after successful copy
+                if is_duplicate:
+                    logger.info(f"Duplicate screenshot found, skipping: {file_path}")
+                    os.remove(file_path)  # Remove duplicate file
+                    return True
+                    
+                target_path = target_dir / unique_filename
+                move_file(file_path, target_path)
             logger.info(f"Moved screenshot to: {target_path}")
             return True
 
@@ -807,21 +1378,21 @@ def process_photo(file_path):
                 new_name = pad_numbers_in_filename(file_path.name)
                 target_dir = base_dir
                 
-            target_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Generate unique filename
-            target_dir, unique_filename, is_duplicate = generate_unique_filename(
-                target_dir, new_name, file_path, use_dashes=True
-            )
+            make_dirs(target_dir)
             
-            if is_duplicate:
-                logger.info(f"Duplicate non-camera image found, skipping: {file_path}")
-                os.remove(file_path)  # Remove duplicate file
-                return True
+            with target_dir_lock(target_dir):
+                # Generate unique filename
+                target_dir, unique_filename, is_duplicate = generate_unique_filename(
+                    target_dir, new_name, file_path, use_dashes=True
+                )
                 
-            target_path = target_dir / unique_filename
-            shutil.copy2(file_path, target_path)
-            os.remove(file_path)  # Remove original file after successful copy
+                if is_duplicate:
+                    logger.info(f"Duplicate non-camera image found, skipping: {file_path}")
+                    os.remove(file_path)  # Remove duplicate file
+                    return True
+                    
+                target_path = target_dir / unique_filename
+                move_file(file_path, target_path)
             logger.info(f"Moved non-camera image to: {target_path}")
             return True
 
@@ -837,34 +1408,65 @@ def process_photo(file_path):
                 return move_to_unprocessed(file_path)
 
             # Generate new filename using existing photo naming convention
-            new_filename = generate_filename(file_path, file_date, camera_make, camera_model)
+            new_filename = generate_filename(file_path, file_date, camera_make, camera_model, metadata)
 
             # Create directories with YYYY/YYYY-MM/YYYY-MM-DD structure
             target_dir = organize_by_date(base_output_dir, file_date)
-
-            # Check if this exact file already exists in the target directory
-            target_dir, unique_filename, is_exact_duplicate = generate_unique_filename(
-                target_dir, 
-                new_filename, 
-                file_path,
-                is_duplicate=True
-            )
+            
+            # Taken after any EXIF date fix, which changes the file
+            source_stat = file_path.stat()
+
+            with target_dir_lock(target_dir):
+                # Check if this exact file already exists in the target directory
+                target_dir, unique_filename, is_exact_duplicate = generate_unique_filename(
+                    target_dir, 
+                    new_filename, 
+                    file_path,
+                    is_duplicate=True
+                )
+                
+                if is_exact_duplicate:
+                    os.remove(file_path)
+                else:
+                    # Move the file and preserve metadata
+                    move_file(file_path, target_dir / unique_filename)
             
             if is_exact_duplicate:
                 logger.info(f"Deleted duplicate file: '{file_path}' (identical to '{target_dir / unique_filename}')")
-                os.remove(file_path)
             else:
-                # Copy the file and preserve metadata
-                shutil.copy2(file_path, target_dir / unique_filename)
-                os.remove(file_path)
                 logger.info(f"Processed: {file_path} -> {target_dir / unique_filename}")
             
+            hash_cache.put_processed(
+                os.path.abspath(file_path), source_stat.st_size, source_stat.st_mtime_ns,
+                os.path.abspath(target_dir / unique_filename)
+            )
             return True
 
     except Exception as e:
         logger.error(f"Error processing {file_path}: {str(e)}")
         return move_to_unprocessed(file_path)
 
+def process_known_file(file_path, target_path, exiftool):
+    """
+    Process a photo that an earlier run already organized as target_path,
+    for example when the same memory card is imported twice.
+    
+    If it is still identical to target_path it is deleted as a duplicate,
+    which is what process_photo would conclude after reading its metadata.
+    Otherwise it is processed normally.
+    """
+    file_path = Path(file_path)
+    target_path = Path(target_path)
+    with target_dir_lock(target_path.parent):
+        is_exact_duplicate = is_duplicate_file(file_path, target_path)
+        if is_exact_duplicate:
+            os.remove(file_path)
+    
+    if is_exact_duplicate:
+        logger.info(f"Deleted duplicate file: '{file_path}' (identical to '{target_path}')")
+        return True
+    return process_photo(file_path, exiftool)
+
 def move_to_unprocessed(file_path):
     """
     Move an unprocessed file to the unprocessed directory.
@@ -881,27 +1483,27 @@ def move_to_unprocessed(file_path):
         original_name = Path(file_path).name
         name, ext = os.path.splitext(original_name)
         
-        # Format the filename: lowercase and dashes
-        formatted_name = name.lower().replace(' ', '-')
-        # Clean up the filename
-        formatted_name = re.sub(r'-+', '-', formatted_name).strip('-')
+        # Format the filename: lowercase, with each run of spaces and dashes
+        # turned into a single dash
+        formatted_name = SPACE_DASH_RUN.sub('-', name.lower()).strip('-')
         new_filename = f"{formatted_name}{ext.lower()}"
         
         # Create target path
         target_path = Path(UNPROCESSED_DIR) / new_filename
         
-        # Ensure unique filename - we don't check for duplicates in unprocessed dir
-        target_dir, unique_filename, _ = generate_unique_filename(
-            UNPROCESSED_DIR, 
-            new_filename, 
-            source_path=file_path,
-            use_dashes=True, 
-            is_duplicate=False  # Don't check for duplicates in unprocessed dir
-        )
-        target_path = target_dir / unique_filename
-        
-        # Move the file
-        shutil.move(str(file_path), str(target_path))
+        with target_dir_lock(UNPROCESSED_DIR):
+            # Ensure unique filename - we don't check for duplicates in unprocessed dir
+            target_dir, unique_filename, _ = generate_unique_filename(
+                UNPROCESSED_DIR, 
+                new_filename, 
+                source_path=file_path,
+                use_dashes=True, 
+                is_duplicate=False  # Don't check for duplicates in unprocessed dir
+            )
+            target_path = target_dir / unique_filename
+            
+            # Move the file
+            shutil.move(str(file_path), str(target_path))
         logger.info(f"Moved unprocessed file to: {target_path}")
         return True
         
@@ -909,99 +1511,60 @@ def move_to_unprocessed(file_path):
         logger.error(f"Error moving unprocessed file {file_path}: {str(e)}")
         return False
 
-def cleanup_directory(directory_path):
+def cleanup_all(root):
     """
-    Clean up a directory by handling unprocessed files, removing hidden files,
-    and removing empty directories recursively (except for the inbox directory).
+    Clean up the directory tree under root in a single bottom-up pass,
+    handling unprocessed files, removing hidden files, and removing empty
+    directories (except for the inbox directory itself).
     - Removes hidden files
     - Moves unprocessable files to unprocessed directory
     - Preserves supported image files in place
     - Removes empty directories
     
-    Args:
-        directory_path: Path object representing the directory to clean
+    Directories are visited deepest first, so a parent is only tried once its
+    subdirectories have been handled. Symlinked directories are not followed.
     
-    Returns:
-        bool: True if directory was removed (either empty or after cleaning)
+    Args:
+        root: Path of the inbox directory to clean
     """
-    try:
-        # Convert to Path object if it's not already
-        dir_path = Path(directory_path)
-        
-        # Don't process the inbox directory
-        if str(dir_path) == INPUT_DIR:
-            return False
-        
-        # First check if directory is already empty
-        try:
-            contents = list(dir_path.iterdir())
-            if not contents:
-                if str(dir_path) != INPUT_DIR:
-                    dir_path.rmdir()
-                    return True
-                return False
-        except Exception as e:
-            logger.error(f"Error accessing {dir_path}: {str(e)}")
-            return False
-        
-        # Process all subdirectories first
-        for item in contents:
-            if item.is_dir():
-                cleanup_directory(item)
-        
-        # Check directory contents again after processing subdirectories
-        try:
-            contents = list(dir_path.iterdir())
-            if not contents and str(dir_path) != INPUT_DIR:
-                dir_path.rmdir()
-                return True
-        except Exception as e:
-            logger.error(f"Error accessing {dir_path}: {str(e)}")
-            return False
-        
-        has_remaining_files = False
+    root = os.path.normpath(root)
+    
+    def log_walk_error(e):
+        logger.error(f"Error accessing {e.filename}: {str(e)}")
+    
+    for dirpath, _, filenames in os.walk(root, topdown=False, onerror=log_walk_error):
         # Process files: remove hidden files, move unprocessable files
-        for item in contents:
-            if item.is_file():
-                if item.name.startswith('.') or item.name.startswith('~$'):
-                    # Remove hidden files
-                    try:
-                        item.unlink()
-                    except Exception as e:
-                        logger.error(f"Could not remove {item}: {str(e)}")
-                        has_remaining_files = True
-                else:
-                    ext = item.suffix.lower()
-                    if ext in SUPPORTED_EXTENSIONS:
-                        # Keep supported image files in place
-                        has_remaining_files = True
-                    else:
-                        # Move unprocessable files to unprocessed directory
-                        if not move_to_unprocessed(item):
-                            has_remaining_files = True
+        for filename in filenames:
+            item = Path(dirpath, filename)
+            if filename.startswith('.') or filename.startswith('~$'):
+                # Remove hidden files
+                try:
+                    item.unlink()
+                except Exception as e:
+                    logger.error(f"Could not remove {item}: {str(e)}")
+            elif item.suffix.lower() not in SUPPORTED_EXTENSIONS:
+                # Move unprocessable files to unprocessed directory; supported
+                # image files are kept in place
+                move_to_unprocessed(item)
         
-        # Final check if directory is empty
-        try:
-            contents = list(dir_path.iterdir())
-            if not contents and str(dir_path) != INPUT_DIR:
-                dir_path.rmdir()
-                return True
-        except Exception as e:
-            logger.error(f"Error accessing {dir_path}: {str(e)}")
-            
-        return not has_remaining_files
+        # Don't remove the inbox directory
+        if dirpath == root:
+            continue
         
-    except Exception as e:
-        logger.error(f"Error cleaning {directory_path}: {str(e)}")
-        return False
+        # Fails for directories that still hold files, which are kept
+        try:
+            os.rmdir(dirpath)
+        except OSError:
+            pass
 
-def update_exif_date(file_path, date_time):
+def update_exif_date(file_path, date_time, exiftool):
     """
-    Update EXIF date fields in the image file.
+    Update EXIF date fields in the image file through the shared ExifToolDaemon.
     
     Args:
         file_path: Path to the image file
         date_time: datetime object with the correct date/time
+        exiftool: Running ExifToolDaemon or ExifToolPool
     
     Returns:
         bool: True if update was successful, False otherwise
@@ -1014,18 +1577,16 @@ def update_exif_date(file_path, date_time):
         original_mtime = os.path.getmtime(file_path)
         
         # Update both CreateDate and DateTimeOriginal
-        cmd = [
-            'exiftool',
+        output = exiftool.execute([
             '-CreateDate=' + date_str,
             '-DateTimeOriginal=' + date_str,
             '-overwrite_original',  # Don't create backup files
             str(file_path)
-        ]
+        ])
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            logger.error(f"Failed to update EXIF data for {file_path}: {result.stderr}")
+        # The daemon has no exit status per command, so check exiftool's summary line
+        if '1 image files updated' not in output:
+            logger.error(f"Failed to update EXIF data for {file_path}: {output.strip()}")
             return False
             
         # Restore original modification time
@@ -1038,7 +1599,7 @@ def update_exif_date(file_path, date_time):
         logger.error(f"Error updating EXIF data for {file_path}: {str(e)}")
         return False
 
-def extract_date(file_path):
+def extract_date(file_path, metadata, exiftool):
     """
     Extract date from EXIF or filename. If EXIF date is invalid but filename
     has a valid date, update the EXIF data.
@@ -1046,7 +1607,7 @@ def extract_date(file_path):
     Returns None if no valid date is found.
     """
     # First try EXIF
-    creation_date = get_exif_creation_date(file_path)
+    creation_date = get_exif_creation_date(metadata)
     
     if not creation_date:
         # Try filename if EXIF failed
@@ -1061,14 +1622,29 @@ def extract_date(file_path):
             
             if is_photo:
                 logger.info(f"Found valid date in filename but invalid EXIF for {file_path}")
-                if update_exif_date(file_path, creation_date):
+                if update_exif_date(file_path, creation_date, exiftool):
                     logger.info(f"Successfully updated EXIF data for {file_path}")
                 else:
                     logger.warning(f"Failed to update EXIF data for {file_path}, but proceeding with filename date")
     
     return creation_date
 
-def generate_filename(file_path, file_date, camera_make, camera_model):
+@lru_cache(maxsize=1024)
+def _camera_part(camera_make, camera_model):
+    """
+    Return the _[CameraMake-Model] filename part, or "" without camera info.
+    Cached, since an import usually comes from only a handful of cameras.
+    """
+    if not (camera_make or camera_model):
+        return ""
+    make_model = []
+    if camera_make:
+        make_model.append(clean_make(camera_make))
+    if camera_model:
+        make_model.append(clean_model(camera_model, camera_make if camera_make else ""))
+    return f"_{'-'.join(make_model)}"
+
+def generate_filename(file_path, file_date, camera_make, camera_model, metadata):
     """
     Generate a new filename based on the file's date, camera make, and model.
     Format: YYYYMMDD-HHMMSS_[ShutterCount]_[CameraMake-Model].[ext]
@@ -1082,23 +1658,16 @@ def generate_filename(file_path, file_date, camera_make, camera_model):
     date_part = file_date.strftime('%Y%m%d-%H%M%S')
 
     # Get shutter count and pad to 6 digits
-    shutter_count = get_shutter_count(file_path)
+    shutter_count = get_shutter_count(metadata)
     shutter_part = f"_{shutter_count:06d}" if shutter_count is not None else ""
 
-    # Clean and format camera info
-    camera_part = ""
-    if camera_make or camera_model:
-        make_model = []
-        if camera_make:
-            make_model.append(clean_make(camera_make))
-        if camera_model:
-            make_model.append(clean_model(camera_model, camera_make if camera_make else ""))
-        camera_part = f"_{'-'.join(make_model)}"
-
     # Combine all parts
-    filename = f"{date_part}{shutter_part}{camera_part}{ext}"
-    
-    return filename
+    return f"{date_part}{shutter_part}{_camera_part(camera_make, camera_model)}{ext}"
+
+def pad_segment(match):
+    """Pad a filename segment matched by NAME_SEGMENT to 3 digits if it's a pure number."""
+    segment = match.group()
+    return segment.zfill(3) if segment.isdigit() else segment
 
 def pad_numbers_in_filename(filename: str) -> str:
     """
@@ -1115,25 +1684,13 @@ def pad_numbers_in_filename(filename: str) -> str:
     # Split filename and extension
     name, ext = os.path.splitext(filename)
     
-    # Split the filename into parts by underscores
-    parts = name.split('_')
+    # Skip padding for the camera model part (last part)
+    prefix, separator, last_part = name.rpartition('_')
+    if '-' in last_part:
+        return f"{NAME_SEGMENT.sub(pad_segment, prefix)}{separator}{last_part}{ext}"
     
-    # Process each part separately
-    for i, part in enumerate(parts):
-        # Skip padding for the camera model part (last part)
-        if i == len(parts) - 1 and '-' in part:
-            continue
-            
-        # For other parts, pad numbers after - or at the start
-        subparts = part.split('-')
-        for j, subpart in enumerate(subparts):
-            # Only pad if it's a pure number
-            if subpart.isdigit():
-                subparts[j] = subpart.zfill(3)
-        parts[i] = '-'.join(subparts)
-    
-    # Rejoin the parts and add extension
-    return '_'.join(parts) + ext
+    # For other parts, pad numbers after - or _ or at the start
+    return NAME_SEGMENT.sub(pad_segment, name) + ext
 
 def generate_unique_filename(base_path, proposed_filename, source_path=None, use_dashes=False, is_duplicate=False):
     """
@@ -1161,7 +1718,7 @@ def generate_unique_filename(base_path, proposed_filename, source_path=None, use
     
     # Remove any existing counter pattern from the name (e.g., '_001', '_002')
     # First try to find the last occurrence of _XXX or -XXX
-    match = re.search(r'([_-]\d{3})(?:[_-]|$)', name)
+    match = COUNTER_SUFFIX.search(name)
     if match:
         counter_part = match.group(1)
         base_name = name[:name.rfind(counter_part)]
@@ -1170,26 +1727,47 @@ def generate_unique_filename(base_path, proposed_filename, source_path=None, use
         base_name = name
     logger.debug(f"  Base name after removing counter: {base_name}")
     
+    # Snapshot the directory once instead of probing each candidate name.
+    # Names are compared casefolded so a case-insensitive filesystem can't
+    # hide a clash (a false clash only costs a higher counter).
+    try:
+        with os.scandir(target_dir) as entries:
+            existing_names = [entry.name for entry in entries]
+    except FileNotFoundError:
+        existing_names = []
+    existing_folded = {existing_name.casefold() for existing_name in existing_names}
+    
     # If we're checking for duplicates, first scan the directory for any existing versions
     if is_duplicate and source_path:
-        # Check the base filename without counter
+        # The base filename without counter, then all numbered versions
         base_pattern = f"{base_name}{ext}"
-        base_file = target_dir / base_pattern
-        logger.debug(f"  Checking base file: {base_file}")
-        if base_file.exists():
-            logger.debug("  Base file exists, checking if duplicate")
-            if is_duplicate_file(source_path, base_file):
-                logger.info(f"Found exact duplicate: '{source_path}' matches existing file '{base_file}'")
-                return target_dir, base_pattern, True
+        candidates = []
+        if base_pattern.casefold() in existing_folded:
+            logger.debug(f"  Base file exists: {target_dir / base_pattern}")
+            candidates.append(base_pattern)
+        pattern = re.compile(re.escape(base_name) + r'[_-][0-9]{3}' + re.escape(ext))
+        logger.debug(f"  Checking numbered versions with pattern: {pattern.pattern}")
+        candidates.extend(sorted(filter(pattern.fullmatch, existing_names)))
         
-        # Check all numbered versions
-        pattern = f"{base_name}[_-][0-9][0-9][0-9]{ext}"
-        logger.debug(f"  Checking numbered versions with pattern: {pattern}")
-        for existing_file in sorted(target_dir.glob(pattern)):
-            logger.debug(f"  Checking numbered file: {existing_file}")
-            if is_duplicate_file(source_path, existing_file):
+        # Only candidates whose size and first block match get a full comparison.
+        # The source is fingerprinted once, when the first candidate needs it.
+        source_signature = quick_signature(source_path) if candidates else None
+        source_fingerprint = None
+        for existing_name in candidates:
+            existing_file = target_dir / existing_name
+            logger.debug(f"  Checking file: {existing_file}")
+            if source_signature and quick_signature(existing_file) != source_signature:
+                logger.debug("  Size or first block differs")
+                continue
+            if source_fingerprint is None:
+                try:
+                    source_fingerprint = file_fingerprint(source_path)
+                except OSError as e:
+                    logger.error(f"Error comparing files: {str(e)}")
+                    break
+            if is_duplicate_file(source_path, existing_file, source_fingerprint):
                 logger.info(f"Found exact duplicate: '{source_path}' matches existing file '{existing_file}'")
-                return target_dir, existing_file.name, True
+                return target_dir, existing_name, True
     
     # If no duplicates found, find a unique filename
     counter = 0
@@ -1199,9 +1777,8 @@ def generate_unique_filename(base_path, proposed_filename, source_path=None, use
         else:
             new_name = f"{base_name}{separator}{counter:03d}{ext}"
             
-        full_path = target_dir / new_name
-        logger.debug(f"  Trying filename: {full_path}")
-        if not full_path.exists():
+        logger.debug(f"  Trying filename: {target_dir / new_name}")
+        if new_name.casefold() not in existing_folded:
             logger.debug(f"  Found unique filename: {new_name}")
             return target_dir, new_name, False
             
@@ -1228,7 +1805,7 @@ def organize_by_date(base_path: Path, date_time: datetime) -> Path:
     day_dir = month_dir / day_str
     
     # Create all directories
-    day_dir.mkdir(parents=True, exist_ok=True)
+    make_dirs(day_dir)
     return day_dir
 
 def extract_timestamp_from_filename(filename: str) -> Optional[tuple[datetime, str]]:
@@ -1248,26 +1825,11 @@ def extract_timestamp_from_filename(filename: str) -> Optional[tuple[datetime, s
     # Try to extract date using existing function first
     date_time = extract_date_from_filename(name)
     if date_time:
-        # Find and remove all possible timestamp patterns
-        patterns = [
-            r'\d{8}[-_]\d{6}',            # YYYYMMDD-HHMMSS or YYYYMMDD_HHMMSS
-            r'\d{4}-\d{2}-\d{2}[-_]\d{2}[-_]\d{2}[-_]\d{2}',  # YYYY-MM-DD-HH-MM-SS or with underscores
-            r'\d{4}[-_]\d{2}[-_]\d{2}[-_]\d{2}[-_]\d{2}[-_]\d{2}',  # YYYY_MM_DD_HH_MM_SS or with dashes
-            r'\d{2}-\d{2}-\d{4}[-_]\d{6}',              # DD-MM-YYYY_HHMMSS
-            r'\d{14}',                                    # YYYYMMDDHHMMSS
-            r'\d{4}-\d{2}-\d{2}',                        # YYYY-MM-DD
-            r'\d{2}-\d{2}-\d{4}',                        # DD-MM-YYYY
-            r'\d{8}',                                     # YYYYMMDD
-            r'\d{6}[-_]\d{6}'                            # DDMMYY-HHMMSS
-        ]
-        
-        remaining = name
-        # Remove all timestamp patterns from the remaining filename
-        for pattern in patterns:
-            remaining = re.sub(pattern, '', remaining)
+        # Remove all timestamp patterns from the remaining filename in one pass
+        remaining = TIMESTAMP_PATTERN.sub('', name)
         
         # Clean up any leftover separators at start/end and multiple separators
-        remaining = re.sub(r'[-_]+', '-', remaining.strip('_- '))
+        remaining = SEPARATOR_RUN.sub('-', remaining.strip('_- '))
         
         if remaining:
             return date_time, remaining
@@ -1276,6 +1838,33 @@ def extract_timestamp_from_filename(filename: str) -> Optional[tuple[datetime, s
     
     return None
 
+def iter_input_entries(root):
+    """
+    Yield a DirEntry for every non-directory entry under root.
+    
+    Walks with os.scandir and an explicit stack, so the type checks come from
+    the directory read without an extra stat() per entry. Each directory is
+    read completely before its entries are yielded, so files being moved out
+    by the workers don't disturb the listing. Symlinked directories are not
+    followed.
+    """
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError as e:
+            logger.error(f"Could not read directory {directory}: {str(e)}")
+            continue
+        
+        for entry in entries:
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    stack.append(entry.path)
+                continue
+            yield entry
+
 def main():
     """
     Main function to process all photos in the input directory and its subdirectories.
@@ -1289,38 +1878,93 @@ def main():
         logger.error(f"Input directory does not exist: {INPUT_DIR}")
         return
     
-    total_files = 0
+    # Start a small pool of exiftool processes that is reused for every file
+    try:
+        exiftool = ExifToolPool()
+    except OSError as e:
+        logger.error(f"Could not start exiftool: {str(e)}")
+        return
+    
     processed_files = 0
+    total_files = 0
     
-    # Collect all directories first
-    all_dirs = set()
-    for root, dirs, files in os.walk(input_path, topdown=False):
-        all_dirs.add(Path(root))
-        
-        # Process files if any
-        for filename in files:
+    def iter_photo_files():
+        """Yield the supported, non-hidden input files as they are found."""
+        nonlocal total_files
+        for entry in iter_input_entries(input_path):
             total_files += 1
-            file_path = Path(root) / filename
+            filename = entry.name
             
             # Skip hidden files
             if filename.startswith('.') or filename.startswith('~$'):
-                logger.debug(f"Skipping hidden/system file: {file_path}")
+                logger.debug(f"Skipping hidden/system file: {entry.path}")
                 continue
             
-            # Get the file extension
-            file_ext = os.path.splitext(filename)[1].lower()
-            
             # Check if it's a supported file type
-            if file_ext in SUPPORTED_EXTENSIONS:
-                logger.info(f"Processing file: {file_path}")
-                if process_photo(file_path):
-                    processed_files += 1
+            if os.path.splitext(filename)[1].lower() in SUPPORTED_EXTENSIONS:
+                yield Path(entry.path)
             else:
-                logger.debug(f"Skipping unsupported file type: {file_path}")
+                logger.debug(f"Skipping unsupported file type: {entry.path}")
+    
+    # Fingerprints of files already in the output directory from earlier runs
+    hash_cache.open()
+    
+    pending_files = threading.BoundedSemaphore(MAX_PENDING_FILES)
+    processed_lock = threading.Lock()
+    
+    def process_one(file_path, metadata, known_target=None):
+        nonlocal processed_files
+        try:
+            logger.info(f"Processing file: {file_path}")
+            
+            if known_target is not None:
+                processed = process_known_file(file_path, known_target, exiftool)
+            else:
+                # Files missing from their batch's results are retried on their own
+                processed = process_photo(file_path, exiftool, metadata)
+            if processed:
+                with processed_lock:
+                    processed_files += 1
+        finally:
+            pending_files.release()
+    
+    # Files are independent, so process them concurrently. Files stream from
+    # the directory walk into metadata batches, and each batch is handed to the
+    # workers as soon as it arrives, so they start on the first files while the
+    # rest of the tree is still being read. The walk and the metadata reads
+    # pause once MAX_PENDING_FILES files are waiting, so a large tree isn't
+    # held in memory as queued work.
+    with exiftool, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        def iter_new_files():
+            """
+            Hand files that an earlier run already organized straight to the
+            workers, and yield the rest for their metadata to be read.
+            """
+            for file_path in iter_photo_files():
+                try:
+                    stat_result = file_path.stat()
+                except OSError:
+                    yield file_path
+                    continue
+                known_target = hash_cache.get_processed(
+                    os.path.abspath(file_path), stat_result.st_size, stat_result.st_mtime_ns
+                )
+                if known_target is not None and os.path.isfile(known_target):
+                    logger.debug(f"Organized by an earlier run as {known_target}: {file_path}")
+                    pending_files.acquire()
+                    executor.submit(process_one, file_path, None, known_target)
+                else:
+                    yield file_path
+        
+        for batch in iter_metadata_batches(iter_new_files(), exiftool):
+            for file_path, metadata in batch:
+                pending_files.acquire()
+                executor.submit(process_one, file_path, metadata)
+    
+    hash_cache.close()
     
     # Clean up all directories bottom-up (from deepest to shallowest)
-    for dir_path in sorted(all_dirs, key=lambda x: len(str(x)), reverse=True):
-        cleanup_directory(dir_path)
+    cleanup_all(input_path)
     
     if total_files > 0:
         logger.info(f"Processed {processed_files} of {total_files} files")